@@ -4,12 +4,15 @@ This is the main file that holds the Tokenizer, Parser, and Interpreter
 """
 import os.path as path
 import re
-import copy as _copy
+import sys
+import builtins as _builtins
+from bisect import bisect_right as _bisect_right
+from collections import OrderedDict
 from decimal import Decimal
 
 from placer.placer import Placer
-from constants import CMND_CHARS, END_LINE_CHARS, ALIGNMENT, TT, TT_M, WHITE_SPACE_CHARS, NON_END_LINE_CHARS, PB_NUM_TABS, PB_NAME_SPACE, STD_FILE_ENDING, STD_LIB_FILE_NAME, OUT_TAB
-from tools import assure_decimal, is_escaped, is_escaping, exec_python, eval_python, string_with_arrows, trimmed, print_progress_bar, prog_bar_prefix, calc_prog_bar_refresh_rate, assert_instance
+from constants import CMND_CHARS, END_LINE_CHARS, END_LINE_CHAR_SET, ALIGNMENT, TT, TT_M, WHITE_SPACE_CHARS, WHITE_SPACE_CHAR_SET, NON_END_LINE_CHARS, NON_END_LINE_CHAR_SET, PB_NUM_TABS, PB_NAME_SPACE, STD_FILE_ENDING, STD_LIB_FILE_NAME, OUT_TAB
+from tools import assure_decimal, exec_python, eval_python, string_with_arrows, trimmed, print_progress_bar, prog_bar_prefix, calc_prog_bar_refresh_rate, assert_instance, paused_gc
 from marked_up_text import MarkedUpText
 from markup import Markup, MarkupStart, MarkupEnd
 from toolbox import ToolBox
@@ -24,8 +27,19 @@ class Error(Exception):
         self.pos_end = pos_end
         self.error_name = error_name
         self.details = details
+        self._string = None # Made by self.as_string the first time it is called
 
     def as_string(self):
+        """
+        Returns the message for this Error. It is only made the first time
+            this method is called because it involves scanning the text of
+            the file that the Error occured in.
+        """
+        if self._string is None:
+            self._string = self._make_string()
+        return self._string
+
+    def _make_string(self):
         result  = f'Line {self.pos_start.ln + 1}, Column {self.pos_start.col + 1}, in file {self.pos_start.file_path}\n'
         result += f'    {self.error_name} Occured: {self.details}'
         result += '\n' + string_with_arrows(self.pos_start.file_text, self.pos_start, self.pos_end)
@@ -47,32 +61,50 @@ class InvalidSyntaxError(Error):
     def __init__(self, pos_start, pos_end, details=''):
         super().__init__(pos_start, pos_end, 'Invalid Syntax Error', details)
 
+class ExpectedTokenError(InvalidSyntaxError):
+    """
+    The error the Parser makes when the current Token is not of the type that
+        a rule needed. The Parser makes one of these every time a rule it
+        tries does not pan out, so the message (which includes the repr of the
+        Token) is only made if the error is actually shown.
+    """
+    def __init__(self, pos_start, pos_end, expected_type, token):
+        super().__init__(pos_start, pos_end, None)
+        self.expected_type = expected_type
+        self.token = token
+
+    def _make_string(self):
+        self.details = f'Expected a Token of type {self.expected_type}, but got token {self.token}'
+        return super()._make_string()
+
 class RunTimeError(Error):
     def __init__(self, pos_start, pos_end, details, context):
         super().__init__(pos_start, pos_end, 'Run-Time Error', details)
         self.context = context
 
     def generate_traceback(self):
-        result = ''
+        # The lines are collected innermost context first and then reversed
+        #   rather than each one being prepended to a growing string
+        lines = []
         pos = self.pos_start
         ctx = self.context
 
         while ctx is not None:
-            result = f'  File {pos.file_path}, line {pos.ln + 1}, in {ctx.display_name}\n' + result
+            lines.append(f'  File {pos.file_path}, line {pos.ln + 1}, in {ctx.display_name}\n')
             pos = ctx.entry_pos
             ctx = ctx.parent
 
-        return 'Traceback (most recent call last):\n' + result
+        lines.reverse()
+        return 'Traceback (most recent call last):\n' + ''.join(lines)
 
 class PythonException(RunTimeError):
     def __init__(self, pos_start, pos_end, details, python_error, context):
-        import traceback
         self.python_error = f'{python_error.exc_trace}'
         super().__init__(pos_start, pos_end, details, context)
         self.error_name = 'Python Exception'
 
-    def as_string(self):
-        string = super().as_string()
+    def _make_string(self):
+        string = super()._make_string()
 
         string += '\nHere is the Python Exception:\n\n'
         string += f'{self.python_error}'
@@ -82,30 +114,100 @@ class PythonException(RunTimeError):
 # -----------------------------------------------------------------------------
 # Position Class
 
+class SourceText:
+    """
+    The file that a group of Positions are in. Every Position in a file
+        shares the one SourceText for it rather than each of them holding
+        their own references to the file's path and text.
+
+    It also knows where each line of the text starts so that the line and
+        column of a Position can be worked out from its index only if they are
+        actually needed (usually just for error messages).
+    """
+    __slots__ = ['file_path', 'file_text', '_text', '_start_ln', '_start_col', '_line_starts']
+    def __init__(self, file_path, file_text, text=None, start_ln=0, start_col=-1):
+        self.file_path = file_path # The path to the file
+        self.file_text = file_text # The text of the file
+        self._text = file_text if text is None else text # The text that the indexes of the Positions are into
+        self._start_ln = start_ln # The line that self._text starts on in the file
+        self._start_col = start_col # The column right before self._text starts in the file
+        self._line_starts = None # Made the first time that it is needed
+
+    def line_and_col(self, idx):
+        """
+        Returns the line and column of the given index into the text.
+        """
+        if self._line_starts is None:
+            # The index that each line of the text starts at. Every end line
+            #   character starts a new line right after it.
+            self._line_starts = [0]
+            self._line_starts.extend(m.end() for m in re.finditer('[\r\n\f]', self._text))
+
+        line = _bisect_right(self._line_starts, idx) - 1
+        col = idx - self._line_starts[line]
+
+        if line == 0:
+            # Still on the line that the text starts on
+            col += self._start_col + 1
+
+        return self._start_ln + line, col
+
 class Position:
     """
     Position in a Tokenized file or a file that is being tokenized.
+
+    Tokens can share Position objects, so copy a Position before changing it.
+
+    If the line and column are not given, they are worked out from the index
+        the first time that they are asked for.
     """
-    __slots__ = ['idx', 'ln', 'col', 'file_path', 'file_text']
-    def __init__(self, idx, ln, col, file_path, file_text):
+    __slots__ = ['idx', '_ln', '_col', 'source']
+    def __init__(self, idx, source, ln=None, col=None):
         self.idx = idx
-        self.ln = ln
-        self.col = col
-        self.file_path = file_path # The path tot he file that this is a position in
-        self.file_text = file_text # The text of the file this is a position in
+        self.source = source # The SourceText of the file that this is a position in
+        self._ln = ln
+        self._col = col
+
+    @property
+    def ln(self):
+        if self._ln is None:
+            self._ln, self._col = self.source.line_and_col(self.idx)
+        return self._ln
+
+    @property
+    def col(self):
+        if self._ln is None:
+            self._ln, self._col = self.source.line_and_col(self.idx)
+        return self._col
+
+    @property
+    def file_path(self):
+        return self.source.file_path
+
+    @property
+    def file_text(self):
+        return self.source.file_text
 
     def advance(self, current_char=None):
+        ln = self.ln # Makes sure that the line and column have been worked out
+
         self.idx += 1
-        self.col += 1
+        self._col += 1
 
-        if current_char in END_LINE_CHARS:
-            self.ln += 1
-            self.col = 0
+        if current_char in END_LINE_CHAR_SET:
+            self._ln = ln + 1
+            self._col = 0
 
         return self
 
     def copy(self):
-        return Position(self.idx, self.ln, self.col, self.file_path, self.file_text)
+        return Position(self.idx, self.source, self._ln, self._col)
+
+    def __reduce__(self):
+        # Pickled as the arguments to remake it with, which is about twice as
+        #   fast to pickle and unpickle as the default of pickling its slots
+        #   as a dict (there are a lot of Positions in an AST)
+        return (Position, (self.idx, self.source, self._ln, self._col))
 
     def __repr__(self):
         file = self.file_path.split('\\')[-1]
@@ -123,7 +225,7 @@ class File:
 
         # Fields set in Compiler._compiler_import_file
         self.raw_text = None # The raw text that is in the file
-        self.tokens = None # The tokens that make up the File once it has been tokenized
+        self.tokens = None # Not kept once the File has been parsed, the ast has all the tokens that are needed
         self.ast = None # The Abstract Syntax tree from the Tokens being Parsed
 
         # Fields set by Compiler._import_file
@@ -147,7 +249,7 @@ class Token:
             #   default is to just put a space before each token is placed down.
             self.space_before = space_before
         else:
-            self.space_before = (space_before in WHITE_SPACE_CHARS)
+            self.space_before = (space_before in WHITE_SPACE_CHAR_SET)
 
         if end_pos is None:
             end_pos = self.start_pos.copy()
@@ -179,9 +281,13 @@ class Token:
             that should be provided when the python code is run in the Placer.
             The Placer already has the globals that should be provided.
         """
-        start_pos = None if self.start_pos is None else self.start_pos.copy()
-        end_pos = None if self.end_pos is None else self.end_pos.copy()
-        return SecondPassPythonToken(self.type, self.value, start_pos, end_pos, self.space_before, locals)
+        # Positions are never changed once made, so the new Token can just
+        #   share them with this one
+        return SecondPassPythonToken(self.type, self.value, self.start_pos, self.end_pos, self.space_before, locals)
+
+    def __reduce__(self):
+        # Pickled as the arguments to remake it with, just like a Position
+        return (type(self), (self.type, self.value, self.start_pos, self.end_pos, self.space_before))
 
     def __repr__(self):
         """
@@ -190,15 +296,41 @@ class Token:
         return f"Token(\"<{self.type}>\":{' ' if self.space_before else ''}{self.value})"
 
 class SecondPassPythonToken(Token):
-    __slots__ = Token.__slots__[:]
-    __slots__.extend(['locals'])
+    __slots__ = ['locals'] # The slots of Token are inherited
     def __init__(self, type, value, start_pos, end_pos=None, space_before=False, locals=None):
         super().__init__(type, value, start_pos, end_pos, space_before)
         self.locals = locals
 
+    def __reduce__(self):
+        return (SecondPassPythonToken, (self.type, self.value, self.start_pos, self.end_pos, self.space_before, self.locals))
+
 # -----------------------------------------------------------------------------
 # Tokenizer Class
 
+# Any white space, including the unicode white space (such as no-break spaces)
+#   that is not in WHITE_SPACE_CHARS and so can end up inside of a word
+_ANY_WHITE_SPACE = re.compile(r'\s+')
+
+def _prefix_table(groups):
+    """
+    Takes (start strings, *values) groups and returns a compiled regex that
+        matches any one of the start strings along with a dict that maps each
+        start string to its values.
+
+    The regex tries the start strings from the longest to the shortest one
+        because a shorter start string would otherwise match before a longer
+        one, even if the longer one would have matched had it been tried
+        (i.e. '\\%' would match before '\\%->' could).
+    """
+    table = {}
+    for starts, *values in groups:
+        for start in starts:
+            table.setdefault(start, tuple(values))
+
+    pattern = re.compile('|'.join(re.escape(start) for start in sorted(table, key=len, reverse=True)))
+    return pattern, table
+
+
 class Tokenizer:
     """
     Takes raw text and tokenizes it.
@@ -207,32 +339,70 @@ class Tokenizer:
         super().__init__()
         self._print_progress_bar = print_progress_bar
 
+        # The current position is kept as a plain int index rather than as a
+        #   Position object so that advancing does not touch an object for
+        #   every character. Position objects are only made (by
+        #   self._make_pos) when a Token or an error actually needs one, and
+        #   their line and column are only worked out from the index if
+        #   something asks for them.
         if starting_position:
             # Parse assuming that you are starting at the given line and column int he file
-            self._pos = starting_position.copy()
-            self._pos.idx = -1
+            self._source = SourceText(starting_position.file_path, starting_position.file_text,
+                    file_text, starting_position.ln, starting_position.col)
         else:
             # Parse assuming that you are starting at the beginning of the file
-            self._pos = Position(-1, 0, -1, file_path, file_text)
+            self._source = SourceText(file_path, file_text)
 
+        self._file_path = self._source.file_path
+        self._idx = -1
         self._text = file_text
+        self._text_len = len(file_text)
+        self._last_pos = None # The Position last given out by self._make_pos
+
         self._current_char = None
         self._previous_char = ''
-        self._plain_text = ''
+        self._plain_text_chars = []
         self._plain_text_start_pos = None
         self._space_before_plaintext = False
         self._unpaired_cbrackets = 0
         self._unpaired_oparens = 0
 
+        # A small direct-mapped cache of words so that repeated ones ("the",
+        #   "and", "of", etc.) share a single str
+        self._intern_cache = [None] * self._INTERN_CACHE_SIZE
+
         self._tokens = []
+        self._append_token = self._tokens.append # Bound once because a Token is appended for nearly every word
         self._advance()
 
     def _advance(self, num=1):
         """Advances to the next character in the text if it should advance."""
-        for i in range(num):
-            self._previous_char = self._current_char
-            self._pos.advance(self._current_char)
-            self._current_char = self._text[self._pos.idx] if self._pos.idx < len(self._text) else None
+        # The line and column are worked out from the index when they are
+        #   needed, so advancing any number of characters is just a jump
+        text = self._text
+        text_len = self._text_len
+        idx = self._idx = self._idx + num
+        self._previous_char = text[idx - 1] if 0 < idx <= text_len else None
+        self._current_char = text[idx] if idx < text_len else None
+
+    def _make_pos(self, idx=None):
+        """
+        Returns a Position object for the given index in the text, or for the
+            current position in the text if no index is given.
+
+        Tokens that start or end at the same index share a single Position
+            object, so a Position given out by this method must be copied
+            before it is changed.
+        """
+        if idx is None:
+            idx = self._idx
+
+        last_pos = self._last_pos
+        if last_pos is not None and last_pos.idx == idx:
+            return last_pos
+
+        self._last_pos = Position(idx, self._source)
+        return self._last_pos
 
     @staticmethod
     def plaintext_tokens_for_str(string, count_starting_space=False):
@@ -246,63 +416,50 @@ class Tokenizer:
             before the first letter as actual space that could produce
             a paragraph break
         """
-        tokens = []
-        idx = -1
-        cc = None
-
-        def next_tok(idx):
-            idx += 1
-            return string[idx] if idx < len(string) else None, idx
-
-        def try_append_word(curr_word, space_before):
-            curr_word = re.sub('(\s)+', '', curr_word)
-            if len(curr_word) > 0:
-                tokens.append(Token(TT.WORD, curr_word, DUMMY_POSITION.copy(), space_before=space_before))
-
-        cc, idx = next_tok(idx)
-
         if not count_starting_space:
             # Eat all end line chars at beginning so no paragraph break at beginning
-            while (cc is not None) and (cc in END_LINE_CHARS):
-                cc, idx, = next_tok(idx)
+            string = string.lstrip(Tokenizer._END_LINE_CHARS_STR)
 
-        space_before = False
-        curr_word = ''
-        while cc is not None:
-            if cc in NON_END_LINE_CHARS:
-                cc, idx = next_tok(idx)
+        # None of the Tokens are from a file, so they can all share one pair
+        #   of dummy Positions
+        dummy_start_pos = DUMMY_POSITION.copy()
+        dummy_end_pos = dummy_start_pos.copy().advance()
 
-                try_append_word(curr_word, space_before)
-                curr_word = ''
-                space_before = True
+        tokens = []
+        append = tokens.append
 
-                while (cc is not None) and (cc in NON_END_LINE_CHARS):
-                    cc, idx, = next_tok(idx)
+        # The words and paragraph breaks are all found by one regex, and
+        #   any white space that is neither is skipped over by it
+        for m in Tokenizer._PLAINTEXT_SCANNER.finditer(string):
+            word = m.group(1)
 
+            if word is None:
+                append(Token(TT.PARAGRAPH_BREAK, Tokenizer._PARAGRAPH_BREAK_VALUE, dummy_start_pos, dummy_end_pos))
                 continue
 
-            elif cc in END_LINE_CHARS:
-                cc, idx = next_tok(idx)
-
-                try_append_word(curr_word, space_before)
-                curr_word = ''
-                space_before = True
-
-                if cc in END_LINE_CHARS:
-                    tokens.append(Token(TT.PARAGRAPH_BREAK, TT.PARAGRAPH_BREAK, DUMMY_POSITION.copy()))
-                    cc, idx = next_tok(idx)
+            # Unicode white space (such as a no-break space) does not split
+            #   words, but is still taken out of them. It is never printable,
+            #   so a printable word has none in it
+            if not word.isprintable():
+                word = _ANY_WHITE_SPACE.sub('', word)
 
-                    while (cc is not None) and (cc in END_LINE_CHARS):
-                        cc, idx, = next_tok(idx)
+            if len(word) > 0:
+                # Anything before a word is white space, so only a word at the
+                #   very start of the string has no space before it
+                append(Token(TT.WORD, word, dummy_start_pos, dummy_end_pos, space_before=(m.start() > 0)))
 
-                continue
-            else:
-                curr_word += cc
-                cc, idx = next_tok(idx)
+        return tokens
 
-        try_append_word(curr_word, space_before)
+    # Every char that the END_LINE_CHARS are made of ('\r\n' is made of two
+    #   of the others)
+    _END_LINE_CHARS_STR = ''.join(c for c in END_LINE_CHARS if len(c) == 1)
 
-        return tokens
+    # Matches either a word (group 1) or a run of two or more END_LINE_CHARS
+    #   in a row, which is a paragraph break
+    _PLAINTEXT_SCANNER = re.compile('([^%s]+)|[%s]{2,}' % (
+            re.escape(''.join(WHITE_SPACE_CHARS)),
+            re.escape(_END_LINE_CHARS_STR)
+        ))
 
     @staticmethod
     def marked_up_text_for_tokens(list_of_tokens):
@@ -358,6 +515,8 @@ class Tokenizer:
 
         def try_token(token_value, token_list):
             if len(token_value) > 0:
+                # token_value may be MarkedUpText, which is not hashable, so
+                #   this has to be a tuple test rather than a set one
                 space_before = (token_value[0] in WHITE_SPACE_CHARS)
                 tokens = Tokenizer.plaintext_tokens_for_str(str(token_value), True)
                 token_value = ''
@@ -411,110 +570,100 @@ class Tokenizer:
         If file is true, the tokenizer assumes that the text is from a file and
             bookends the tokens with TT.FILE_START and TT.FILE_END
         """
-        self._tokens = []
-        self._plain_text = ''
-        escape_sequences = {'\\{':'{', '\\}':'}', '\\=':'=', '\\\\':'\\', '\\(':'(', '\\)':')', '\\,':','}
+        self._tokens = tokens = []
+        self._append_token = append_token = tokens.append
+        self._plain_text_chars.clear()
 
         if file:
-            self._tokens.append(Token(TT.FILE_START, '<FILE START>', self._pos.copy()))
+            tokens.append(Token(TT.FILE_START, '<FILE START>', self._make_pos()))
 
+        text = self._text
+        text_len = len(text)
         print_progress = self._print_progress_bar
 
         if print_progress:
-            text_len = len(self._text)
-            prefix = prog_bar_prefix('Tokenizing', self._pos.file_path)
+            prefix = prog_bar_prefix('Tokenizing', self._file_path)
             refresh = calc_prog_bar_refresh_rate(text_len)
+            next_refresh = 0
             full_bar_printed = False
 
             if print_progress_bar(0, text_len, prefix):
                 full_bar_printed = True
 
+        # Bind everything the loop uses on every iteration to locals
+        lex = self._LEXER.match
+        get_handler = self._CHAR_HANDLERS.get
+        plain_text_chars = self._plain_text_chars
+        start_plain_text = self._start_plain_text
+        try_word_token = self._try_word_token
+        make_pos = self._make_pos
+        intern = self._intern
+        word_end_offsets = self._WORD_END_OFFSETS
+
         # By default, all text is plain text until something says otherwise
-        while self._current_char is not None:
+        while self._idx < text_len:
 
-            i = self._pos.idx
+            i = self._idx
 
-            if print_progress and (i % refresh) == 0:
+            # Plain text is skipped a run at a time, so i may jump right over
+            #   a multiple of refresh
+            if print_progress and i >= next_refresh:
                 print_progress_bar(i, text_len, prefix)
+                next_refresh = i - (i % refresh) + refresh
 
-            cc = self._current_char
-
-            t = None
-
-            if self._match(escape_sequences.keys(), False):
-                # Handle the escape sequence
-                match = self._match(escape_sequences.keys(), True)
-                self._advance(len(match)) # Advance past the escape sequence
-                self._plain_text += escape_sequences[match] # Add the char that was escaped
-
-            elif cc in END_LINE_CHARS:
-                self._try_word_token()
-                self._advance()
-
-                pos_start = self._pos.copy()
-
-                if self._current_char in END_LINE_CHARS:
-
-                    while self._current_char in END_LINE_CHARS:
-                        # Do nothing, just eat the END_LINE_CHARS now that we know that there is a PARAGRAPH_BREAK
-                        self._advance()
-
-                    t = Token(TT.PARAGRAPH_BREAK, TT.PARAGRAPH_BREAK, pos_start, self._pos.copy())
-            elif cc in NON_END_LINE_CHARS:
-                self._try_word_token()
-                self._advance()
-            elif cc == '{':
-                if self._unpaired_cbrackets == 0:
-                    self._first_unpaired_bracket_pos = self._pos.copy()
-                self._unpaired_cbrackets += 1
-                t = Token(TT.OCBRACE, '{', self._pos.copy(), space_before=self._previous_char)
-                self._advance()
-
-            elif cc == '}':
-                self._unpaired_cbrackets -= 1
-                if self._unpaired_cbrackets < 0:
-                    raise InvalidSyntaxError(self._pos.copy(), self._pos.copy().advance(),
-                            'Unpaired, unescaped, closing curly bracket "}". You need to add an open curly bracket "{" before it or escape it by putting a backslash before it.')
-                t = Token(TT.CCBRACE, '}', self._pos.copy(), space_before=self._previous_char)
-                self._advance()
-
-            elif cc == '=':
-                t = Token(TT.EQUAL_SIGN, '=', self._pos.copy(), space_before=self._previous_char)
-                self._advance()
-            elif cc == '(':
-
-                if self._unpaired_oparens == 0:
-                    self._first_unpaired_oparens_pos = self._pos.copy()
-                self._unpaired_oparens += 1
-                t = Token(TT.OPAREN, '(', self._pos.copy(), space_before=self._previous_char)
-                self._advance()
-
-            elif cc == ')':
-
-                self._unpaired_oparens -= 1
-                if self._unpaired_oparens < 0:
-                    raise InvalidSyntaxError(self._pos.copy(), self._pos.copy().advance(),
-                            'Unpaired, unescaped, closing parenthesis ")". You need to add an open curly bracket "(" before it or escape it by putting a backslash before it.')
-                t = Token(TT.CPAREN, ')', self._pos.copy(), space_before=self._previous_char)
-                self._advance()
-
-            elif cc == ',':
-                t = Token(TT.COMMA, ',', self._pos.copy(), space_before=self._previous_char)
-                self._advance()
-            elif cc == '\\':
-                t = self._tokenize_cntrl_seq()
-            else:
-                self._plain_text_char()
+            # Words and the white space between them (by far the most common
+            #   case) are taken by the lexer a word at a time
+            m = lex(text, i)
+            end = m.end()
+
+            if end > i:
+                word_end = m.end(1)
+
+                if word_end == i:
+                    # Just white space, which ends the current word
+                    try_word_token()
+
+                else:
+                    # A word followed by white space is always whole, but one
+                    #   that runs right up to a char with a handler is only
+                    #   whole if that handler ends it
+                    end_offset = 0 if word_end < end else word_end_offsets.get(text[end:end + 1])
+
+                    if end_offset is not None and self._plain_text_start_pos is None and text[i:word_end].isprintable():
+                        # A whole word on its own, so make its Token directly.
+                        #   The only white space that is printable is ' ', which
+                        #   cannot be in a word, so a printable word has no
+                        #   white space in it that would need to be taken out
+                        append_token(Token(TT.WORD, intern(text[i:word_end]), make_pos(i), make_pos(word_end + end_offset),
+                                space_before=(i > 0 and text[i - 1] in WHITE_SPACE_CHAR_SET)))
+
+                    else:
+                        # The word may be part of a longer one (such as one with
+                        #   an escaped char in it), so it goes through the buffer
+                        start_plain_text()
+                        plain_text_chars.append(text[i:word_end])
+
+                        if word_end < end:
+                            self._advance(word_end - i)
+                            try_word_token()
+                            i = word_end
+
+                self._advance(end - i)
+                continue
+
+            # Python Switch Statement. Every character that is neither plain
+            #   text nor white space has a handler
+            t = get_handler(text[i])(self)
 
             if t is not None:
                 # Actually append the Token (or list of tokens) if there is a Token to append
-                self._try_word_token()
+                try_word_token()
 
                 if isinstance(t, Token):
-                    self._tokens.append(t)
+                    append_token(t)
                 else:
                     # t must be a list of tokens
-                    self._tokens.extend(t)
+                    tokens.extend(t)
 
         if print_progress and not full_bar_printed:
             print_progress_bar(text_len, text_len, prefix)
@@ -527,103 +676,183 @@ class Tokenizer:
             raise InvalidSyntaxError(self._first_unpaired_oparens_pos.copy(), self._first_unpaired_oparens_pos.copy().advance(),
                     f'{self._unpaired_oparens} unpaired, unescaped, opening parenthes(es) "(" starting from this open parenthes(es). Either escape each one by putting a backslash before them or pair them with a closing parenthesis ")".')
 
-        self._try_word_token()
+        try_word_token()
 
         if file:
-            self._tokens.append(Token(TT.FILE_END, '<FILE END>', self._pos.copy()))
+            tokens.append(Token(TT.FILE_END, '<FILE END>', self._make_pos()))
 
-        return self._tokens
+        return tokens
 
     # -------------------------------------------------------------------------
-    # Parsing Methods
+    # Character Handlers
 
-    def _tokenize_cntrl_seq(self):
+    def _tokenize_end_line(self):
         """
-        Parse a control sequence.
+        Tokenizes an END_LINE_CHAR, producing a PARAGRAPH_BREAK if it is
+            followed by more END_LINE_CHARS.
         """
         t = None
+        self._try_word_token()
+        self._advance()
 
-        pos_start = self._pos.copy()
-
-        # NOTE: Multi-line matches tend be longer and so need to come before
-        #   single-line matches because shorter matches will match before longer
-        #   matches, even if the longer match would have worked had it been tried
-
-        # Multiple Line Python ----------------------
-        if self._match(TT_M.MULTI_LINE_PYTH_1PASS_EXEC_START):
-            t = self._tokenize_python(TT_M.MULTI_LINE_PYTH_1PASS_EXEC_END, 1, pos_start)
-
-        elif self._match(TT_M.MULTI_LINE_PYTH_1PASS_EVAL_START):
-            t = self._tokenize_python(TT_M.MULTI_LINE_PYTH_1PASS_EVAL_END, 1, pos_start, use_eval=True)
+        pos_start = self._make_pos()
 
-        elif self._match(TT_M.MULTI_LINE_PYTH_2PASS_EXEC_START):
-            t = self._tokenize_python(TT_M.MULTI_LINE_PYTH_2PASS_EXEC_END, 2, pos_start)
+        if self._eat_end_lines():
+            t = Token(TT.PARAGRAPH_BREAK, self._PARAGRAPH_BREAK_VALUE, pos_start, self._make_pos())
+        return t
 
-        elif self._match(TT_M.MULTI_LINE_PYTH_2PASS_EVAL_START):
-            t = self._tokenize_python(TT_M.MULTI_LINE_PYTH_2PASS_EVAL_END, 2, pos_start, use_eval=True)
+    def _eat_end_lines(self):
+        """
+        Advances past the run of END_LINE_CHARS at the current position, all
+            at once, and returns whether there were any.
+        """
+        end = self._END_LINE_RUN.match(self._text, self._idx).end()
+
+        if end > self._idx:
+            self._advance(end - self._idx)
+            return True
+        return False
+
+    _END_LINE_RUN = re.compile('[%s]*' % re.escape(_END_LINE_CHARS_STR))
+
+    def _tokenize_ocbrace(self):
+        if self._unpaired_cbrackets == 0:
+            self._first_unpaired_bracket_pos = self._make_pos()
+        self._unpaired_cbrackets += 1
+        return self._single_char_token(TT.OCBRACE)
+
+    def _tokenize_ccbrace(self):
+        self._unpaired_cbrackets -= 1
+        if self._unpaired_cbrackets < 0:
+            raise InvalidSyntaxError(self._make_pos(), self._make_pos(self._idx + 1),
+                    'Unpaired, unescaped, closing curly bracket "}". You need to add an open curly bracket "{" before it or escape it by putting a backslash before it.')
+        return self._single_char_token(TT.CCBRACE)
+
+    def _tokenize_equal_sign(self):
+        return self._single_char_token(TT.EQUAL_SIGN)
+
+    def _tokenize_oparen(self):
+        if self._unpaired_oparens == 0:
+            self._first_unpaired_oparens_pos = self._make_pos()
+        self._unpaired_oparens += 1
+        return self._single_char_token(TT.OPAREN)
+
+    def _tokenize_cparen(self):
+        self._unpaired_oparens -= 1
+        if self._unpaired_oparens < 0:
+            raise InvalidSyntaxError(self._make_pos(), self._make_pos(self._idx + 1),
+                    'Unpaired, unescaped, closing parenthesis ")". You need to add an open curly bracket "(" before it or escape it by putting a backslash before it.')
+        return self._single_char_token(TT.CPAREN)
+
+    def _tokenize_comma(self):
+        return self._single_char_token(TT.COMMA)
+
+    def _tokenize_backslash(self):
+        """
+        Tokenizes an escape sequence such as \\{ or, if the backslash does not
+            start one, a control sequence.
+        """
+        # Every escape sequence is a backslash and one char, so whether the
+        #   backslash starts one is a single lookup of the two chars
+        escaped_char = self._ESCAPE_SEQUENCES.get(self._text[self._idx:self._idx + 2])
+        if escaped_char is not None:
+            # Handle the escape sequence. The escaped char is plain text, so it
+            #   may be what starts the current word
+            self._start_plain_text()
+            self._plain_text_chars.append(escaped_char) # Add the char that was escaped
+            self._advance(2) # Advance past the escape sequence
+            return None
 
-        # One Line Python -----------------------
-        elif self._match(TT_M.ONE_LINE_PYTH_1PASS_EXEC_START):
-            t = self._tokenize_python(TT_M.ONE_LINE_PYTH_1PASS_EXEC_END, 1, pos_start, one_line=True)
+        return self._tokenize_cntrl_seq()
+
+    _ESCAPE_SEQUENCES = {'\\{':'{', '\\}':'}', '\\=':'=', '\\\\':'\\', '\\(':'(', '\\)':')', '\\,':','}
+
+    # Maps each character that is neither plain text nor white space (which
+    #   are handled by self._LEXER) to the method that tokenizes it
+    _CHAR_HANDLERS = {
+        **dict.fromkeys(END_LINE_CHARS, _tokenize_end_line),
+        '{': _tokenize_ocbrace,
+        '}': _tokenize_ccbrace,
+        '=': _tokenize_equal_sign,
+        '(': _tokenize_oparen,
+        ')': _tokenize_cparen,
+        ',': _tokenize_comma,
+        '\\': _tokenize_backslash,
+    }
+
+    # The value of every PARAGRAPH_BREAK Token. Made once here so that they
+    #   all share it instead of each one turning TT.PARAGRAPH_BREAK into a str
+    _PARAGRAPH_BREAK_VALUE = str(TT.PARAGRAPH_BREAK)
+
+    # Matches the run of plain text (group 1) at an index and then the run of
+    #   white space that does not end a line (group 2) after it. If both are
+    #   empty, then the char at the index has a handler.
+    _LEXER = re.compile('([^%s]*)([%s]*)' % (
+            re.escape(''.join(_CHAR_HANDLERS) + ''.join(NON_END_LINE_CHARS)),
+            re.escape(''.join(NON_END_LINE_CHARS))
+        ))
+
+    # For each char (or '' for the end of the text) that ends a word when it
+    #   comes right after one, how far past the end of the word the word's
+    #   Token ends. Single char Tokens are made before the word before them is,
+    #   so that word ends after them, while an END_LINE_CHAR ends the word
+    #   before it is tokenized. A backslash is not in here because it may
+    #   escape a char that is part of the word.
+    _WORD_END_OFFSETS = {
+        **dict.fromkeys(END_LINE_CHARS, 0),
+        **dict.fromkeys('{}=(),', 1),
+        '': 0,
+    }
 
-        elif self._match(TT_M.ONE_LINE_PYTH_1PASS_EVAL_START):
-            t = self._tokenize_python(TT_M.ONE_LINE_PYTH_1PASS_EVAL_END, 1, pos_start, one_line=True, use_eval=True)
+    # -------------------------------------------------------------------------
+    # Parsing Methods
 
-        elif self._match(TT_M.ONE_LINE_PYTH_2PASS_EXEC_START):
-            t = self._tokenize_python(TT_M.ONE_LINE_PYTH_2PASS_EXEC_END, 2, pos_start, one_line=True)
+    def _tokenize_cntrl_seq(self):
+        """
+        Parse a control sequence.
+        """
+        pos_start = self._make_pos()
 
-        elif self._match(TT_M.ONE_LINE_PYTH_2PASS_EVAL_START):
-            t = self._tokenize_python(TT_M.ONE_LINE_PYTH_2PASS_EVAL_END, 2, pos_start, one_line=True, use_eval=True)
+        # Try all of the control sequence starts at once
+        start = self._CNTRL_SEQ_START_RE.match(self._text, self._idx)
 
-        # Comment ----------------------
-        elif self._match(TT_M.MULTI_LINE_COMMENT_START):
-            t = self._tokenize_comment(pos_start, one_line=False)
-
-        elif self._match(TT_M.SINGLE_LINE_COMMENT_START):
-            t = self._tokenize_comment(pos_start, one_line=True)
+        if start is not None:
+            start = start.group()
+            tokenize_method, kwargs = self._CNTRL_SEQ_STARTS[start]
+            self._advance(len(start))
+            return tokenize_method(self, pos_start=pos_start, **kwargs)
 
         # Command --------------------------
-        else:
-            # It is an identifier, so tokenize it
-            t = self._tokenize_identifier()
-
-        return t
+        # It is an identifier, so tokenize it
+        return self._tokenize_identifier()
 
     def _tokenize_python(self, end_codes, pass_num, pos_start, one_line=False, use_eval=False):
         """
-        Parses the string from self._pos as python code until one of the end_codes
+        Parses the string from the current position as python code until one of the end_codes
             are reached.
 
         If one_line is true, that means that this python statement is supposed
             to only be one line so it cannot turn the rest of the file
             into python.
         """
-        python_str = ''
+        pos_end = self._make_pos()
+        python_start = self._idx
 
-        pos_end = self._pos.copy()
-        match_found = False
+        # Everything up to the end code is python
+        match_found = self._advance_to(end_codes)
+        python_str = self._text[python_start:self._idx]
 
-        while self._current_char is not None:
-            if self._match(end_codes, False):
-
-                # Only eat the chars if they are not in the END_LINE_CHARS.
-                #   Otherwise it is needed in order to determine whether to put
-                #   in a PARAGRAPH_BREAK
-                if not self._current_char in END_LINE_CHARS:
-                    self._match(end_codes)
-
-                match_found = True
-                break
-            else:
-                # Since python has not ended yet, just add the given char to it
-                python_str += self._current_char
-                self._advance()
+        # Only eat the chars if they are not in the END_LINE_CHARS.
+        #   Otherwise it is needed in order to determine whether to put
+        #   in a PARAGRAPH_BREAK
+        if match_found and not self._current_char in END_LINE_CHAR_SET:
+            self._match(end_codes)
 
         if (self._current_char is None) and (not match_found) and (not one_line):
             raise InvalidSyntaxError(pos_start, pos_end,
                     f'You made the rest of your file Python because there was no matching character sequence to end the Python section of your document denoted by this character sequence.')
 
-        pos_end = self._pos.copy()
+        pos_end = self._make_pos()
 
         if pass_num == 1:
             if use_eval:
@@ -642,26 +871,18 @@ class Tokenizer:
             the comment is done. None of the characters are put into any Token,
             so the Parser will never even see them.
         """
-        pos_end = self._pos.copy()
+        pos_end = self._make_pos()
         if one_line:
             # Its a one_line comment
-            while self._current_char is not None:
-                if self._match(TT_M.SINGLE_LINE_COMMENT_END):
-                    break
-                else:
-                    self._advance()
+            if self._advance_to(TT_M.SINGLE_LINE_COMMENT_END):
+                self._match(TT_M.SINGLE_LINE_COMMENT_END)
         else:
-            found_match = False
-
             # it's a continous comment, so parse until '<-%\' or '<-#\' is found
-            while self._current_char is not None:
-                if self._match(TT_M.MULTI_LINE_COMMENT_END):
-                    found_match = True
-                    break
-                else:
-                    self._advance()
+            found_match = self._advance_to(TT_M.MULTI_LINE_COMMENT_END)
 
-            if self._current_char is None and not found_match:
+            if found_match:
+                self._match(TT_M.MULTI_LINE_COMMENT_END)
+            else:
                 raise InvalidSyntaxError(pos_start, pos_end, 'You commented out the rest of your file because there was no matching "<-%\\" or "<-#\\" to end the comment.')
 
         if len(self._tokens) > 0 and self._tokens[-1].type == TT.PARAGRAPH_BREAK:
@@ -670,90 +891,179 @@ class Tokenizer:
             #   ignored and there being white space before it. Two PARAGRAPH_BREAKs
             #   next to eachother breaks all grammar rules and causes the Parser
             #   to terminate early (i.e. before it reaches the FILE_END token)
-            while self._current_char in END_LINE_CHARS:
-                self._advance()
+            self._eat_end_lines()
 
     def _tokenize_identifier(self):
         """
         Tokenize an identifier like \\bold or \\i
         """
-        identifier_name = ''
-
-        start_pos = self._pos.copy()
+        start_pos = self._make_pos()
         space_before = self._previous_char
 
         #tokens = []
-        #tokens.append(Token(TT.BACKSLASH, '\\', start_pos.copy(), self._pos.copy(), space_before=space_before))
+        #tokens.append(Token(TT.BACKSLASH, '\\', start_pos.copy(), self._make_pos(), space_before=space_before))
 
         self._advance() # advance past '\\'
 
-        problem_start = self._pos.copy()
+        # The whole name is matched at once, and a name that runs right up to
+        #   the end of the text is still a name
+        name_match = self._CMND_NAME.match(self._text, self._idx)
 
-        while self._current_char is not None:
-            if self._current_char in CMND_CHARS:
-                identifier_name += self._current_char
-                self._advance()
-            else:
-                if len(identifier_name) == 0:
+        if name_match is None:
+            bad_char = 'The end of the file' if self._current_char is None else f'"{self._current_char}"'
+            raise ExpectedValidCmndNameError(self._make_pos(), self._make_pos(),
+                    f'All commands must specify a valid name with all characters of it in {CMND_CHARS}\n{bad_char} is not one of the valid characters. You either forgot to designate a valid command name or forgot to escape the backslash before this character.')
+
+        self._advance(name_match.end() - self._idx)
+
+        # Identifiers are the names of commands, so they are interned
+        #   for good because they are used as the keys of SymbolTables
+        return Token(TT.IDENTIFIER, sys.intern(name_match.group()), start_pos, self._make_pos(), space_before=space_before)
 
-                    raise ExpectedValidCmndNameError(problem_start, self._pos.copy(),
-                            f'All commands must specify a valid name with all characters of it in {CMND_CHARS}\n"{self._current_char}" is not one of the valid characters. You either forgot to designate a valid command name or forgot to escape the backslash before this character.')
+    _CMND_NAME = re.compile('[%s]+' % re.escape(CMND_CHARS))
 
-                token = Token(TT.IDENTIFIER, identifier_name, start_pos.copy(), self._pos.copy(), space_before=space_before)
+    # Everything other than a command that a control sequence can start, in
+    #   the form (start strings, method to tokenize it with, keyword arguments
+    #   for the method)
+    _CNTRL_SEQ_START_RE, _CNTRL_SEQ_STARTS = _prefix_table((
+        # Multiple Line Python ----------------------
+        (TT_M.MULTI_LINE_PYTH_1PASS_EXEC_START, _tokenize_python, dict(end_codes=TT_M.MULTI_LINE_PYTH_1PASS_EXEC_END, pass_num=1)),
+        (TT_M.MULTI_LINE_PYTH_1PASS_EVAL_START, _tokenize_python, dict(end_codes=TT_M.MULTI_LINE_PYTH_1PASS_EVAL_END, pass_num=1, use_eval=True)),
+        (TT_M.MULTI_LINE_PYTH_2PASS_EXEC_START, _tokenize_python, dict(end_codes=TT_M.MULTI_LINE_PYTH_2PASS_EXEC_END, pass_num=2)),
+        (TT_M.MULTI_LINE_PYTH_2PASS_EVAL_START, _tokenize_python, dict(end_codes=TT_M.MULTI_LINE_PYTH_2PASS_EVAL_END, pass_num=2, use_eval=True)),
+
+        # One Line Python -----------------------
+        (TT_M.ONE_LINE_PYTH_1PASS_EXEC_START, _tokenize_python, dict(end_codes=TT_M.ONE_LINE_PYTH_1PASS_EXEC_END, pass_num=1, one_line=True)),
+        (TT_M.ONE_LINE_PYTH_1PASS_EVAL_START, _tokenize_python, dict(end_codes=TT_M.ONE_LINE_PYTH_1PASS_EVAL_END, pass_num=1, one_line=True, use_eval=True)),
+        (TT_M.ONE_LINE_PYTH_2PASS_EXEC_START, _tokenize_python, dict(end_codes=TT_M.ONE_LINE_PYTH_2PASS_EXEC_END, pass_num=2, one_line=True)),
+        (TT_M.ONE_LINE_PYTH_2PASS_EVAL_START, _tokenize_python, dict(end_codes=TT_M.ONE_LINE_PYTH_2PASS_EVAL_END, pass_num=2, one_line=True, use_eval=True)),
 
-                return token
+        # Comment ----------------------
+        (TT_M.MULTI_LINE_COMMENT_START, _tokenize_comment, dict(one_line=False)),
+        (TT_M.SINGLE_LINE_COMMENT_START, _tokenize_comment, dict(one_line=True)),
+    ))
 
     # -------------------------------------------------------------------------
     # Other Helper Methods
 
+    def _single_char_token(self, type):
+        """
+        Makes a Token of the given type for the current char, which is the only
+            char in it, and advances past it.
+        """
+        t = Token(type, self._current_char, self._make_pos(), self._make_pos(self._idx + 1), space_before=self._previous_char)
+        self._advance()
+        return t
+
     def _try_word_token(self):
         """
-        Create a WORD token given what is in self._plain_text
+        Create a WORD token given what is in self._plain_text_chars
         """
-        self._plain_text = re.sub('(\s)+', '', self._plain_text)
+        if not self._plain_text_chars:
+            return
+
+        # The chars are collected in a list and only joined here because
+        #   repeatedly doing str += char is quadratic for long runs of text
+        plain_text = _ANY_WHITE_SPACE.sub('', ''.join(self._plain_text_chars))
+        self._plain_text_chars.clear()
 
-        if len(self._plain_text) > 0:
-            self._tokens.append(Token(TT.WORD, self._plain_text, self._plain_text_start_pos, self._pos.copy(), space_before=self._space_before_plaintext))
+        if len(plain_text) > 0:
+            self._append_token(Token(TT.WORD, self._intern(plain_text), self._plain_text_start_pos, self._make_pos(), space_before=self._space_before_plaintext))
             self._space_before_plaintext = False
-            self._plain_text = ''
             self._plain_text_start_pos = None
 
-    def _plain_text_char(self):
+    _INTERN_CACHE_SIZE = 2048 # must be a power of 2
+    _MAX_INTERN_LEN = 32
+
+    def _intern(self, text):
         """
-        The current_char is a plain_text character
+        Returns a previously seen str equal to text if there is one in the
+            intern cache, otherwise caches text and returns it.
+
+        The cache is direct-mapped (a slot is picked from the first char, last
+            char, and length of the text and a collision just overwrites the
+            slot) so a lookup is only a couple of operations.
+        """
+        if len(text) > self._MAX_INTERN_LEN:
+            return text
+
+        slot = ((ord(text[0]) * 31 + ord(text[-1])) ^ (len(text) << 5)) & (self._INTERN_CACHE_SIZE - 1)
+        cached = self._intern_cache[slot]
+
+        if cached == text:
+            return cached
+
+        self._intern_cache[slot] = text
+        return text
+
+    def _start_plain_text(self):
+        """
+        Records where the current word starts if the plain text at the current
+            position is the first of it.
         """
         if self._plain_text_start_pos is None:
-            self._plain_text_start_pos = self._pos.copy()
+            self._plain_text_start_pos = self._make_pos()
 
-            if self._pos.idx - 1 >= 0:
-                self._space_before_plaintext = (self._text[self._pos.idx - 1] in WHITE_SPACE_CHARS)
+            if self._idx - 1 >= 0:
+                self._space_before_plaintext = (self._text[self._idx - 1] in WHITE_SPACE_CHAR_SET)
             else:
                 self._space_before_plaintext = False
 
-        self._plain_text += self._current_char
-        self._advance()
+    # The compiled patterns used by self._advance_to, by the tuple of strings
+    #   that they search for
+    _SEARCH_PATTERNS = {}
 
-    def _match(self, matches:list, advance_past_on_match=True):
+    def _advance_to(self, matches:tuple):
         """
-        Takes the given list of strings to match and sees if any of them match
+        Advances to the next place in the text where one of the given strings
+            matches, without advancing past it, and returns True. If none of
+            them match anywhere in the rest of the text, advances to the end
+            of the text and returns False.
+
+        The search is done by one compiled regex, so long stretches of text
+            (i.e. python code and comments) are skipped without going through
+            them one character at a time.
+        """
+        pattern = self._SEARCH_PATTERNS.get(matches)
+
+        if pattern is None:
+            pattern = re.compile('|'.join(re.escape(str_to_match) for str_to_match in matches))
+            self._SEARCH_PATTERNS[matches] = pattern
+
+        found = pattern.search(self._text, self._idx)
+        self._advance((self._text_len if found is None else found.start()) - self._idx)
+        return found is not None
+
+    def _match(self, matches:tuple, advance_past_on_match=True):
+        """
+        Takes the given tuple of strings to match and sees if any of them match
             the text at the current index of the self._text
 
-        This method takes the given list and checks if any of the strings in
+        This method takes the given tuple and checks if any of the strings in
             it matches the text from the current position onward. That is,
             if a string in matches is 'hello', then only if
             self._text[curr_pos:curr_pos + 5] matches 'hello' will this method
             return a truthy value (it returns the match, will evaluate to true
             so long as the match is not an empty string which would only
             happen if you pass an empty string in as part of the `matches`
-            list). Returns an empty string ('') if no match is found.
+            tuple). Returns an empty string ('') if no match is found.
 
         If advance_past_on_match, then if this method matches something, it will
             advance past the string it matched.
         """
-        index = self._pos.idx
+        text = self._text
+        index = self._idx
+
+        # Nothing matches most of the time, so check all of the strings at once
+        #   before working out which one it was
+        if not text.startswith(matches, index):
+            return ''
+
+        # str.startswith already fails for a string that would run past the
+        #   end of the text, so a match that ends right at the end of the text
+        #   is still a match
         for str_to_match in matches:
-            if ((index + len(str_to_match)) < len(self._text)) \
-                    and (str_to_match == self._text[index:index + len(str_to_match)]):
+            if text.startswith(str_to_match, index):
 
                 if advance_past_on_match:
                     self._advance(len(str_to_match))
@@ -763,7 +1073,9 @@ class Tokenizer:
 # -----------------------------------------------------------------------------
 # Nodes for Parser
 
-DUMMY_POSITION = Position(0, 0, 0, 'Dummy File Name', 'Dummy File Text')
+# The Position of things that are not from a file. Like every other Position,
+#   it can be shared, so it is never changed without being copied first.
+DUMMY_POSITION = Position(0, SourceText('Dummy File Name', 'Dummy File Text'), 0, 0)
 
 class LeafNode:
     """
@@ -803,7 +1115,7 @@ class DocumentNode:
         elif len(paragraphs) > 0:
             self.start_pos = paragraphs[0].start_pos
         else:
-            self.start_pos = DUMMY_POSITION.copy()
+            self.start_pos = DUMMY_POSITION
 
         if len(paragraphs) > 0:
             self.end_pos = paragraphs[-1].end_pos
@@ -812,7 +1124,7 @@ class DocumentNode:
         elif starting_paragraph_break:
             self.end_pos = starting_paragraph_break.end_pos
         else:
-            self.end_pos = DUMMY_POSITION.copy()
+            self.end_pos = DUMMY_POSITION
 
     def __repr__(self):
         return f'{self.__class__.__name__}({self.paragraphs})'
@@ -834,8 +1146,7 @@ class ParagraphNode:
         return f'{self.__class__.__name__}({self.writing})'
 
 class WritingNode(LeafNode):
-    __slots__ = LeafNode.__slots__[:]
-    __slots__.extend(['writing'])
+    __slots__ = ['writing'] # The slots of LeafNode are inherited
     def __init__(self, writing):
         """
         writing can be either a python node or a plain_text node.
@@ -847,8 +1158,7 @@ class WritingNode(LeafNode):
         return f'{self.__class__.__name__}({self.writing})'
 
 class PythonNode(LeafNode):
-    __slots__ = LeafNode.__slots__[:]
-    __slots__.extend(['python', 'python_string'])
+    __slots__ = ['python', 'python_string'] # The slots of LeafNode are inherited
     def __init__(self, python):
         """
         python is a single python Token (PASS1EXEC|PASS2EXEC|PASS1EVAL|PASS2EVAL)
@@ -964,8 +1274,7 @@ class TextGroupNode:
         return f'{self.__class__.__name__}({self.document})'
 
 class PlainTextNode(LeafNode):
-    __slots__ = LeafNode.__slots__[:]
-    __slots__.extend(['plain_text'])
+    __slots__ = ['plain_text'] # The slots of LeafNode are inherited
     def __init__(self, plain_text:list):
         """
         plain_text is a list of OCBRACE, CCBRACE, EQUAL_SIGN, and WORD Tokens
@@ -977,8 +1286,8 @@ class PlainTextNode(LeafNode):
             self.start_pos = plain_text[0].start_pos
             self.end_pos = plain_text[-1].end_pos
         else:
-            self.start_pos = DUMMY_POSITION.copy()
-            self.end_pos = DUMMY_POSITION.copy()
+            self.start_pos = DUMMY_POSITION
+            self.end_pos = DUMMY_POSITION
 
     def __repr__(self):
         return f'{self.__class__.__name__}({self.plain_text})'
@@ -1063,6 +1372,65 @@ class ParseResult:
             self.error = error
         return self
 
+    def copy(self):
+        new = ParseResult()
+        new.error = self.error
+        new.node = self.node
+        new.last_registered_advance_count = self.last_registered_advance_count
+        new.advance_count = self.advance_count
+        new.to_reverse_count = self.to_reverse_count
+        new.affinity = self.affinity
+        return new
+
+class _Memo:
+    """
+    The memo that the Parser's packrat rules store their results in. It only
+        holds onto the most recently used max_size results so that the memo
+        cannot grow to hold a result for every token of a large file.
+    """
+    __slots__ = ['_results', '_max_size']
+    def __init__(self, max_size):
+        self._results = OrderedDict()
+        self._max_size = max_size
+
+    def get(self, key):
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+        return result
+
+    def set(self, key, result):
+        self._results[key] = result
+        if len(self._results) > self._max_size:
+            self._results.popitem(last=False)
+
+def _packrat(rule):
+    """
+    Memoizes the given Parser rule by the index of the token that the rule is
+        started at (i.e. makes it a packrat parsing rule).
+
+    A rule's result only depends on where in the tokens it starts, so when a
+        rule is tried again at the same index (because a rule further up
+        failed and the Parser backtracked to try something else) the Parser is
+        just moved to where the rule ended last time and a copy of the last
+        result is returned, rather than parsing all of the same tokens again.
+    """
+    def packrat_rule(self):
+        key = (rule, self._tok_idx)
+        memo = self._memo.get(key)
+
+        if memo is None:
+            res = rule(self)
+            self._memo.set(key, (res, self._tok_idx, self._current_tok))
+            return res
+
+        res, self._tok_idx, self._current_tok = memo
+        return res.copy()
+
+    packrat_rule.__name__ = rule.__name__
+    packrat_rule.__doc__ = rule.__doc__
+    return packrat_rule
+
 class Parser:
     """
     Creates an Abstract Syntax Tree based on the rules in grammar.txt.
@@ -1079,6 +1447,20 @@ class Parser:
         approach to parsing, which is a far harder method of parsing to write
         a Parser for.
     """
+    # The most packrat rule results that the Parser will remember at once
+    _MEMO_SIZE = 100_000
+
+    # The types of the Tokens that hold Python code
+    _PYTHON_TYPES = frozenset((TT.EXEC_PYTH1, TT.EVAL_PYTH1, TT.EXEC_PYTH2, TT.EVAL_PYTH2))
+
+    # The types of the Tokens that plain text can be made of
+    _PLAIN_TEXT_TYPES = frozenset((TT.BACKSLASH, TT.EQUAL_SIGN, TT.COMMA,
+            TT.OPAREN, TT.CPAREN, TT.OBRACE, TT.CBRACE, TT.WORD))
+
+    # Matches a run of plain text Tokens in the Parser's _types bytes, which
+    #   hold the type of each Token in the same order as the Tokens themselves
+    _PLAIN_TEXT_RUN = re.compile(b'[' + re.escape(bytes(sorted(_PLAIN_TEXT_TYPES))) + b']*')
+
     def __init__(self, tokens, print_progress_bar=False):
 
         # Progress Printing Info
@@ -1089,9 +1471,27 @@ class Parser:
         self._prog_bar_refresh = calc_prog_bar_refresh_rate(self._tokens_len)
 
         # Things needed to actually parse the tokens
-        self._tokens = tokens
+
+        # The Tokens are given a NONE_LEFT Token at the end so that running out
+        #   of them is just another index. TT.NONE_LEFT will NOT match any
+        #   Tokens needed for any rule, forcing an error to occur in each rule
+        #   and the rules to terminate. This is much safer than just not
+        #   changing the token any more when you run out of tokens to parse
+        #   because now, even if you have a low-level rule that will accept
+        #   infinitely many of a token of a certain type, that type will not be
+        #   infinitely given if the list of tokens ends on it
+        if self._tokens_len > 0:
+            none_left = Token(TT.NONE_LEFT, 'NO TOKENS LEFT', tokens[-1].start_pos, tokens[-1].end_pos)
+        else:
+            none_left = Token(TT.NONE_LEFT, 'NO TOKENS LEFT', DUMMY_POSITION, DUMMY_POSITION)
+        self._tokens = [*tokens, none_left]
+
+        # Every TT fits in a byte, so the types of all the Tokens can be kept
+        #   side by side and scanned without touching the Tokens themselves
+        self._types = bytes([token.type for token in tokens])
         self._tok_idx = -1
         self._current_tok = None
+        self._memo = _Memo(self._MEMO_SIZE) # (rule, token index) -> (ParseResult, token index after, current token after)
         self._advance()
 
     def parse(self):
@@ -1112,6 +1512,18 @@ class Parser:
 
         return res
 
+    def parse_or_raise(self):
+        """
+        Parses the tokens and returns the root node of the abstract syntax
+            tree, raising the parse error instead if there was one.
+        """
+        res = self.parse()
+
+        if res.error is not None:
+            raise res.error
+
+        return res.node
+
     # ------------------------------
     # Main Helper Methods
 
@@ -1122,11 +1534,19 @@ class Parser:
         """
         prev_token = self._current_tok
 
-        if parse_result:
-            parse_result.register_advancement()
+        if parse_result is not None:
+            # Same as parse_result.register_advancement(), but this is done
+            #   for every single token so it is done inline
+            parse_result.last_registered_advance_count = 1
+            parse_result.advance_count += 1
 
         self._tok_idx += 1
-        self._update_current_tok()
+
+        try:
+            self._current_tok = self._tokens[self._tok_idx]
+        except IndexError:
+            # Advanced past the NONE_LEFT Token at the end of the Tokens
+            self._current_tok = self._tokens[-1]
 
         return prev_token
 
@@ -1135,22 +1555,9 @@ class Parser:
         self._update_current_tok()
 
     def _update_current_tok(self):
-        if self._tok_idx >= 0 and self._tok_idx < len(self._tokens):
-            self._current_tok = self._tokens[self._tok_idx]
-        else:
-            # TT.NONE_LEFT will NOT match any Tokens needed for any rule,
-            #   forcing an error to occur in each rule and the rules to
-            #   terminate. This is much safer than just not changing the token
-            #   any more when you run out of tokens to parse because now, even if
-            #   you have a low-level rule that will accept infinitely many of a
-            #   token of a certain type, that type will not be infinitely given
-            #   if the list of tokens ends on it
-            if self._current_tok is not None:
-                self._current_tok = Token(TT.NONE_LEFT, 'NO TOKENS LEFT', self._current_tok.start_pos.copy(), self._current_tok.end_pos.copy())
-            else:
-                dummy_start_pos = DUMMY_POSITION.copy()
-                dummy_end_pos = dummy_start_pos.copy()
-                self._current_tok = Token(TT.NONE_LEFT, 'NO TOKENS LEFT', dummy_start_pos, dummy_end_pos)
+        # Any index outside of the Tokens gets the NONE_LEFT Token at the end
+        idx = self._tok_idx
+        self._current_tok = self._tokens[idx] if 0 <= idx < self._tokens_len else self._tokens[-1]
 
     # ------------------------------
     # Rules
@@ -1176,7 +1583,7 @@ class Parser:
             file_end = self._advance(res)
         else:
             return res.failure(InvalidSyntaxError(self._current_tok.start_pos.copy(), self._current_tok.end_pos.copy(),
-                f'Reached the end of the file but there was no FILE_END Token. The file must have Invalid Syntax or the compiler is having issues.\nALL TOKENS: {self._tokens}\n\nLAST TOKEN SEEN: {self._current_tok}\n\nLast Token Seen Index: {self._tok_idx}'))
+                f'Reached the end of the file but there was no FILE_END Token. The file must have Invalid Syntax or the compiler is having issues.\nALL TOKENS: {self._tokens[:self._tokens_len]}\n\nLAST TOKEN SEEN: {self._current_tok}\n\nLast Token Seen Index: {self._tok_idx}'))
 
         return res.success(FileNode(file_start, document, file_end))
 
@@ -1231,8 +1638,6 @@ class Parser:
         """
         res = ParseResult()
 
-        start_pos = self._current_tok.start_pos.copy()
-
         # Check for Paragraph Break
         paragraph_break = self._eat_pb(res)
 
@@ -1247,6 +1652,7 @@ class Parser:
         #   type PARAGRAPH_BREAK
         return res.success(ParagraphNode(paragraph_break, writing))
 
+    @_packrat
     def _writing(self):
         """
         A peice of writing such as something to run in python, a command def
@@ -1254,32 +1660,39 @@ class Parser:
         """
         res = ParseResult()
 
-        start_pos = self._current_tok.start_pos.copy()
+        # Each kind of writing can only start with certain types of Token, so
+        #   a kind is only tried if the current Token can start it. Trying any
+        #   other kind would just fail on the first Token with no affinity,
+        #   making an error that could never be the one reported
+        first_type = self._current_tok.type
 
         results = []
-        new_res = self._python()
-        results.append(new_res)
-        writing = res.register_try(new_res)
+        writing = None
 
-        if not writing:
-            self._reverse(res)
-            new_res = self._cmnd_def()
+        if first_type in self._PYTHON_TYPES:
+            new_res = self._python()
             results.append(new_res)
             writing = res.register_try(new_res)
 
-        if not writing:
+        if not writing and first_type == TT.IDENTIFIER:
             self._reverse(res)
-            new_res = self._cmnd_call()
+            new_res = self._cmnd_def()
             results.append(new_res)
             writing = res.register_try(new_res)
 
-        if not writing:
+            if not writing:
+                self._reverse(res)
+                new_res = self._cmnd_call()
+                results.append(new_res)
+                writing = res.register_try(new_res)
+
+        if not writing and first_type in self._PLAIN_TEXT_TYPES:
             self._reverse(res)
             new_res = self._plain_text()
             results.append(new_res)
             writing = res.register_try(new_res)
 
-        if not writing:
+        if not writing and first_type == TT.OCBRACE:
             self._reverse(res)
             new_res = self._text_group()
             results.append(new_res)
@@ -1307,19 +1720,11 @@ class Parser:
         """
         res = ParseResult()
 
-        ct = self._current_tok
-        type = self._current_tok.type
+        python = self._current_tok
 
-        # Python Switch Statement to figure out whether the token is a Python Token
-        try:
-            python = {
-                TT.EXEC_PYTH1: ct,
-                TT.EVAL_PYTH1: ct,
-                TT.EXEC_PYTH2: ct,
-                TT.EVAL_PYTH2: ct
-            }[ct.type]
-        except KeyError:
-            return res.failure(InvalidSyntaxError(ct.start_pos.copy(), ct.start_pos.copy().advance(),
+        # Figure out whether the token is a Python Token
+        if python.type not in self._PYTHON_TYPES:
+            return res.failure(InvalidSyntaxError(python.start_pos.copy(), python.start_pos.copy().advance(),
                     'Expected a Token of Type PASS1EXEC, PASS1EVAL, PASS2EXEC, or PASS1EVAL but did not get one.')
                 )
 
@@ -1613,6 +2018,7 @@ class Parser:
 
         return res.success(CommandKeyArgNode(ident, text_group))
 
+    @_packrat
     def _text_group(self):
         """
         A text group is
@@ -1639,42 +2045,31 @@ class Parser:
 
     def _plain_text(self):
         res = ParseResult()
-        plain_text = []
 
-        while True:
-            cc = self._current_tok
-            start_pos = cc.start_pos
+        # Nearly every Token is plain text, so rather than advancing one Token
+        #   at a time, the whole run of them is found by scanning their types
+        #   and then consumed in one go
+        start_idx = self._tok_idx
+        end_idx = self._PLAIN_TEXT_RUN.match(self._types, start_idx).end()
 
-            # Python Switch Statement
-            try:
-                new_tok = {
-                    TT.BACKSLASH: cc,
-                    TT.EQUAL_SIGN: cc,
-                    TT.COMMA: cc,
-                    TT.OPAREN: cc,
-                    TT.CPAREN: cc,
-                    TT.OBRACE: cc,
-                    TT.CBRACE: cc,
-                    TT.WORD: cc
-                }[cc.type]
-
-                # If I remember correctly, you cannot directly wrap the dict
-                #   in this append method because it appends the error
-                #   to the list when there is an error, which is problematic
-                plain_text.append(new_tok)
-                res.add_affinity()
-
-            except KeyError:
-                break
-
-            self._advance(res)
-
-        if len(plain_text) == 0:
+        if end_idx <= start_idx:
+            start_pos = self._current_tok.start_pos
             return res.failure(InvalidSyntaxError(start_pos.copy(), start_pos.copy().advance(),
                         'Expected atleast 1 WORD, BACKSLASH, OCBRACE, CCBRACE, or EQUAL_SIGN Token.'
                     )
                 )
 
+        plain_text = self._tokens[start_idx:end_idx]
+
+        # Same as calling self._advance(res) and res.add_affinity() once for
+        #   each Token in the run
+        count = end_idx - start_idx
+        res.last_registered_advance_count = 1
+        res.advance_count += count
+        res.affinity += count
+        self._tok_idx = end_idx
+        self._update_current_tok()
+
         # plain_text is a list of OCBRACE, CCBRACE, EQUAL_SIGN, and WORD Tokens
         #   in any order.
         return res.success(PlainTextNode(plain_text))
@@ -1711,10 +2106,11 @@ class Parser:
             a lot in the parse methods.
         """
         res = ParseResult()
+        ct = self._current_tok
 
-        if not (self._current_tok.type == token_type):
-            return res.failure(InvalidSyntaxError(self._current_tok.start_pos.copy(), self._current_tok.end_pos.copy(),
-                        f'Expected a Token of type {token_type}, but got token {self._current_tok}'))
+        if ct.type != token_type:
+            # Tokens' Positions are never changed, so the error can share them
+            return res.failure(ExpectedTokenError(ct.start_pos, ct.end_pos, token_type, ct))
 
         return res.success(self._advance(res))
 
@@ -1729,7 +2125,8 @@ class RunTimeResult:
     """
     __slots__ = ['value', 'error']
     def __init__(self):
-        self.reset()
+        self.value = None
+        self.error = None
 
     def reset(self):
         self.value = None
@@ -1743,13 +2140,16 @@ class RunTimeResult:
         self.error = res.error
         return res.value
 
+    # success and failure set both fields themselves rather than calling
+    #   reset() first because one of them is called for every Node visited
+
     def success(self, value):
-        self.reset()
         self.value = value
+        self.error = None
         return self
 
     def failure(self, error):
-        self.reset()
+        self.value = None
         self.error = error
         return self
 
@@ -1757,18 +2157,32 @@ class SymbolTable:
     """
     The symbol table is used to store the commands.
     """
+    __slots__ = ['symbols', 'parent']
     def __init__(self, parent=None):
         self.symbols = {}
         self.parent = parent
 
+    # What dict.get returns when a name is not in a SymbolTable's symbols
+    _NOT_FOUND = object()
+
     def get(self, name):
         """
         Returns the value for the name if it is in the SymbolTable, None otherwise
         """
-        value = self.symbols.get(name, None)
-        if value == None and self.parent:
-          return self.parent.get(name)
-        return value
+        # Walk up the parents in a loop rather than recursively, since there
+        #   is a parent for every command call that the lookup is nested in
+        not_found = self._NOT_FOUND
+        table = self
+
+        while table is not None:
+            value = table.symbols.get(name, not_found)
+
+            if value is not not_found:
+                return value
+
+            table = table.parent
+
+        return None
 
     def set(self, name, value):
         """
@@ -1953,6 +2367,7 @@ class InterpreterFlags:
         that things in the flags stay the same for the entire AST pass
         whereas the things in the context could change at each visit to a node.
     """
+    __slots__ = []
     def __init__(self):
         pass
 
@@ -2011,9 +2426,8 @@ class Interpreter:
         return result
 
     def visit(self, node, context, flags):
-        method_name = f'_visit_{type(node).__name__}'
-        method = getattr(self, method_name, self._no_visit_method)
-        return method(node, context, flags)
+        # Python Switch Statement. _VISIT_METHODS is made right after this class
+        return self._VISIT_METHODS.get(type(node), Interpreter._no_visit_method)(self, node, context, flags)
 
     def _no_visit_method(self, node, context, flags):
         raise Exception(f'No _visit_{type(node).__name__} method defined in Interpreter')
@@ -2040,15 +2454,22 @@ class Interpreter:
         if was_global:
             context.global_level = False
 
+        # Bound to locals because they are used for every paragraph
+        visit = self.visit
+        register = res.register
+        extend_document = document.extend
+
         for paragraph in node.paragraphs:
-            write_tokens = res.register(self.visit(paragraph, context, flags))
+            write_tokens = register(visit(paragraph, context, flags))
 
             if res.error:
                 return res
             else:
                 if was_global:
+                    # Not bound before the loop because a paragraph could
+                    #   give the context a new token document
                     context.token_document().extend(write_tokens)
-                document.extend(write_tokens)
+                extend_document(write_tokens)
 
         if was_global:
             context.global_level = True
@@ -2061,8 +2482,10 @@ class Interpreter:
         # How long the document has gotten so far
         i = len(context.token_document())
 
-        # Visit the writing (could be Plaintext, Python, command def, or a Command call)
-        write_tokens = res.register(self.visit(node.writing, context, flags))
+        # Visit the writing (could be Plaintext, Python, command def, or a Command call).
+        #   The WritingNode just wraps it, so the writing in the WritingNode
+        #   is visited directly rather than going through _visit_WritingNode
+        write_tokens = res.register(self.visit(node.writing.writing, context, flags))
 
         if res.error:
             return res
@@ -2335,6 +2758,11 @@ class Interpreter:
         """
         pass
 
+# The method that visits each type of Node, by the type of Node i.e.
+#   {DocumentNode: Interpreter._visit_DocumentNode, ...}
+Interpreter._VISIT_METHODS = {globals()[name[len('_visit_'):]]: method
+        for name, method in vars(Interpreter).items() if name.startswith('_visit_')}
+
 # -----------------------------------------------------------------------------
 # Compiler Class
 
@@ -2414,7 +2842,7 @@ class Compiler:
     """
     This object orchestrates the compilation of plaintext files into PDFs
     """
-    def __init__(self, input_file_path, path_to_std_dir, print_progess_bars=False, encoding='utf-8'):
+    def __init__(self, input_file_path, path_to_std_dir, print_progess_bars=False, encoding='utf-8', ast_cache_dir=None):
         self._commands = {}
         self._files_by_path = {}
         assert path.isfile(input_file_path), f'The given path is not to a file or does not exist: {input_file_path}'
@@ -2423,6 +2851,7 @@ class Compiler:
         self._std_dir_path = path_to_std_dir
         self._print_progress_bars = print_progess_bars
         self._encoding = encoding # The encoding that the pdfo files are in
+        self._ast_cache_dir = ast_cache_dir # The directory to cache the ASTs of files in, None if they should not be cached
 
         self._toolbox = ToolBox(self)
         self._compiler_poxy = CompilerProxy(self)
@@ -2435,7 +2864,9 @@ class Compiler:
         #   is needed
         self._globals = {'__name__': __name__, '__doc__': None, '__package__': None,
             '__loader__': __loader__, '__spec__': None, '__annotations__': None,
-            '__builtins__': _copy.deepcopy(globals()['__builtins__']),
+            # A shallow copy is enough since builtins are only ever removed
+            #   from this dict, never changed in place
+            '__builtins__': dict(vars(_builtins)),
             'compiler':self._compiler_poxy, 'toolbox':self._toolbox}
 
         #   remove any problematic builtins from the globals
@@ -2558,19 +2989,90 @@ class Compiler:
         except:
             raise AssertionError(f'Could not decode the given file as {self._encoding}.')
 
+        file.ast = self._load_cached_ast(file)
 
-        file.tokens = Tokenizer(file.file_path, file.raw_text, print_progress_bar=print_progress).tokenize()
+        if file.ast is not None:
+            return file
 
-        # Returns a ParseResult, so need to see if any errors. If no Errors, then set file.ast to the actual abstract syntax tree
-        file.ast = Parser(file.tokens, print_progress_bar=print_progress).parse()
+        # The tokens are not kept on the File because the AST holds onto every
+        #   Token that it needs. Keeping the list of all of them around for as
+        #   long as the File is cached would only take up memory.
+        # Neither the Tokens nor the Nodes made from them are ever in a
+        #   reference cycle, so there is nothing for the cyclic garbage
+        #   collector to find while they are being made
+        with paused_gc():
+            tokens = Tokenizer(file.file_path, file.raw_text, print_progress_bar=print_progress).tokenize()
+            file.ast = Parser(tokens, print_progress_bar=print_progress).parse_or_raise()
 
-        if file.ast.error is not None:
-            raise file.ast.error
-        else:
-            file.ast = file.ast.node
+        self._cache_ast(file)
 
         return file
 
+    # Bump this whenever the Tokenizer/Parser output or the Token/Node layout
+    #   changes so that ASTs cached by an older version of the compiler are not
+    #   loaded
+    _AST_CACHE_VERSION = 6
+
+    def _ast_cache_path(self, file):
+        """
+        Returns the path that the AST of the given File is cached at. The path
+            is named after a hash of everything that the AST depends on, so a
+            file that has changed at all will not load its old AST.
+        """
+        import hashlib
+
+        file_hash = hashlib.blake2b(digest_size=20)
+        file_hash.update(f'{self._AST_CACHE_VERSION}\0{file.file_path}\0'.encode('utf-8', 'surrogatepass'))
+        file_hash.update(file.raw_text.encode('utf-8', 'surrogatepass'))
+        return path.join(self._ast_cache_dir, file_hash.hexdigest() + '.pkl')
+
+    def _load_cached_ast(self, file):
+        """
+        Returns the cached AST of the given File, or None if AST caching is off
+            or there is no usable cached AST for it.
+        """
+        if self._ast_cache_dir is None:
+            return None
+
+        import pickle
+
+        try:
+            with open(self._ast_cache_path(file), 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            # Either there is nothing cached or it is unreadable, either way
+            #   the file just has to be tokenized and parsed again
+            return None
+
+    def _cache_ast(self, file):
+        """
+        Caches the AST of the given File if AST caching is on.
+        """
+        if self._ast_cache_dir is None:
+            return
+
+        import os
+        import pickle
+
+        cache_path = self._ast_cache_path(file)
+        temp_path = f'{cache_path}.{os.getpid()}.tmp'
+
+        try:
+            os.makedirs(self._ast_cache_dir, exist_ok=True)
+
+            # Write to a temporary file first so that a compile running at the
+            #   same time can never load a half written AST
+            with open(temp_path, 'wb') as f:
+                pickle.dump(file.ast, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except Exception:
+            # Not being able to cache the AST is not worth failing the compile
+            #   over
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
     def _run_file(self, file, context, print_progress=False):
         """
         Runs a file, importing it first if need be, and returns the tokens and
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 import re
 from collections import namedtuple as named_tuple
 
@@ -51,42 +51,58 @@ class VAR_TYPES(Enum):
 # The characters that a valid control sequence can have
 CMND_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_0123456789"
 
-class TT(Enum):
-    """Token Types"""
-    BACKSLASH = 'BACKSLASH'          # r'\'
+class TT(IntEnum):
+    """
+    Token Types
+
+    They are ints so that comparing, hashing (dict and set lookups by type are
+        done all over the Tokenizer and Parser), and pickling them is cheap.
+        They still print like a normal Enum, i.e. TT.WORD.
+    """
+    __str__ = Enum.__str__
+    __format__ = Enum.__format__
+
+    BACKSLASH = 1         # r'\'
 
     # --------------------------------------
     # Ones Actually in Use by Tokenizer or Parser
-    COMMA = 'COMMA'                  # r','
-    OCBRACE = 'OPENING CURLY BRACE'  # r'{'
-    CCBRACE = 'CLOSING CURLY BRACE'  # r'}'
-    EQUAL_SIGN = 'EQUALS SIGN'       # r'='
+    COMMA = 2             # r','
+    OCBRACE = 3           # r'{'
+    CCBRACE = 4           # r'}'
+    EQUAL_SIGN = 5        # r'='
 
-    OPAREN = 'OPENNING PARENTHESIS'  # r'('
-    CPAREN = 'CLOSING PARENTHESIS'   # r')'
-    OBRACE = 'OPENING BRACE'         # r'['
-    CBRACE = 'CLOSING BRACE'         # r']'
+    OPAREN = 6            # r'('
+    CPAREN = 7            # r')'
+    OBRACE = 8            # r'['
+    CBRACE = 9            # r']'
 
-    EXEC_PYTH1 = 'PYTHON EXEC FIRST PASS'
-    EVAL_PYTH1 = 'PYTHON EVAL FIRST PASS'
-    EXEC_PYTH2 = 'PYTHON EXEC SECOND PASS'
-    EVAL_PYTH2 = 'PYTHON EVAL SECOND PASS'
+    EXEC_PYTH1 = 10       # Python exec first pass
+    EVAL_PYTH1 = 11       # Python eval first pass
+    EXEC_PYTH2 = 12       # Python exec second pass
+    EVAL_PYTH2 = 13       # Python eval second pass
 
-    PARAGRAPH_BREAK = 'PARAGRAPH BREAK'
+    PARAGRAPH_BREAK = 14
 
-    IDENTIFIER = 'IDENTIFIER'
+    IDENTIFIER = 15
 
-    FILE_START = 'FILE START'
-    FILE_END = 'FILE END'
+    FILE_START = 16
+    FILE_END = 17
 
-    WORD = 'WORD'
+    WORD = 18
 
-    NONE_LEFT = 'NONE_LEFT' # For Parser when there are no more Tokens to parse
+    NONE_LEFT = 19 # For Parser when there are no more Tokens to parse
 
 END_LINE_CHARS = ('\r\n', '\r', '\n', '\f') # White space that would start a new line/paragraph
 NON_END_LINE_CHARS = (' ', '\t', '\v') # White space that would not start a new line/paragraph
 WHITE_SPACE_CHARS = (' ', '\t', '\n', '\r', '\f', '\v') # all white space
 
+# The same chars as above, but as frozensets for testing whether a single char
+#   is one of them. The tuples are kept because the order of END_LINE_CHARS
+#   matters when they are matched ('\r\n' must be tried before '\r')
+END_LINE_CHAR_SET = frozenset(END_LINE_CHARS)
+NON_END_LINE_CHAR_SET = frozenset(NON_END_LINE_CHARS)
+WHITE_SPACE_CHAR_SET = frozenset(WHITE_SPACE_CHARS)
+
 # The relative path to the standard library
 STD_LIB_FILE_NAME = '__std_lib__'
 STD_DIR = './__std__/'
@@ -110,41 +126,43 @@ class TT_M:
     """
     What the more complex tokens should each match.
     """
+    # NOTE: These are tuples so that the Tokenizer can give them straight to
+    #   str.startswith
     # NOTE: the matches must start with \ because of where they are matched in
     #   the Tokenizer
 
     # PYTHON CODE IDENTIFIERS
     #   FIRST PASS PYTHON
     #       EXEC PYTHON
-    ONE_LINE_PYTH_1PASS_EXEC_START =    ['\\>', '\\1>']
-    ONE_LINE_PYTH_1PASS_EXEC_END =      [*nl('<\\', '<1\\'), *END_LINE_CHARS]
-    MULTI_LINE_PYTH_1PASS_EXEC_START =  ['\\->', '\\1->']
-    MULTI_LINE_PYTH_1PASS_EXEC_END =    [*nl('<-\\', '<-1\\')]
+    ONE_LINE_PYTH_1PASS_EXEC_START =    ('\\>', '\\1>')
+    ONE_LINE_PYTH_1PASS_EXEC_END =      (*nl('<\\', '<1\\'), *END_LINE_CHARS)
+    MULTI_LINE_PYTH_1PASS_EXEC_START =  ('\\->', '\\1->')
+    MULTI_LINE_PYTH_1PASS_EXEC_END =    (*nl('<-\\', '<-1\\'),)
 
     #       EVAL PYTHON
-    ONE_LINE_PYTH_1PASS_EVAL_START =    ['\\?>', '\\1?>']
-    ONE_LINE_PYTH_1PASS_EVAL_END =      [*nl('<\\', '<?\\', '<?1\\'), *END_LINE_CHARS]
-    MULTI_LINE_PYTH_1PASS_EVAL_START =  ['\\1?->']
-    MULTI_LINE_PYTH_1PASS_EVAL_END =    [*nl('<-\\', '<-?1\\')]
+    ONE_LINE_PYTH_1PASS_EVAL_START =    ('\\?>', '\\1?>')
+    ONE_LINE_PYTH_1PASS_EVAL_END =      (*nl('<\\', '<?\\', '<?1\\'), *END_LINE_CHARS)
+    MULTI_LINE_PYTH_1PASS_EVAL_START =  ('\\1?->',)
+    MULTI_LINE_PYTH_1PASS_EVAL_END =    (*nl('<-\\', '<-?1\\'),)
 
     #   SECOND PASS PYTHON
     #       EXEC PYTHON
-    ONE_LINE_PYTH_2PASS_EXEC_START =    ['\\2>']
-    ONE_LINE_PYTH_2PASS_EXEC_END =      [*nl('<\\', '<2\\'), *END_LINE_CHARS]
-    MULTI_LINE_PYTH_2PASS_EXEC_START =  ['\\2->']
-    MULTI_LINE_PYTH_2PASS_EXEC_END =    [*nl('<-\\', '<-2\\')]
+    ONE_LINE_PYTH_2PASS_EXEC_START =    ('\\2>',)
+    ONE_LINE_PYTH_2PASS_EXEC_END =      (*nl('<\\', '<2\\'), *END_LINE_CHARS)
+    MULTI_LINE_PYTH_2PASS_EXEC_START =  ('\\2->',)
+    MULTI_LINE_PYTH_2PASS_EXEC_END =    (*nl('<-\\', '<-2\\'),)
 
     #       EVAL PYTHON
-    ONE_LINE_PYTH_2PASS_EVAL_START =    ['\\2?>']
-    ONE_LINE_PYTH_2PASS_EVAL_END =      [*nl('<\\', '<?\\', '<?2\\'), *END_LINE_CHARS]
-    MULTI_LINE_PYTH_2PASS_EVAL_START =  ['\\?->']
-    MULTI_LINE_PYTH_2PASS_EVAL_END =    [*nl('<-\\', '<-?\\')]
+    ONE_LINE_PYTH_2PASS_EVAL_START =    ('\\2?>',)
+    ONE_LINE_PYTH_2PASS_EVAL_END =      (*nl('<\\', '<?\\', '<?2\\'), *END_LINE_CHARS)
+    MULTI_LINE_PYTH_2PASS_EVAL_START =  ('\\?->',)
+    MULTI_LINE_PYTH_2PASS_EVAL_END =    (*nl('<-\\', '<-?\\'),)
 
     # COMMENT IDENTIFIERS (NOTE: The start of each one must start with a backslash because of where the matching takes place in the tokenizer)
-    SINGLE_LINE_COMMENT_START        = ['\\%', '\\#']
-    SINGLE_LINE_COMMENT_END          = [*nl('%\\', '#\\'), *END_LINE_CHARS]
-    MULTI_LINE_COMMENT_START         = ['\\%->', '\\#->']
-    MULTI_LINE_COMMENT_END           = [*nl('<-\\', '<-%\\', '<-#\\')]
+    SINGLE_LINE_COMMENT_START        = ('\\%', '\\#')
+    SINGLE_LINE_COMMENT_END          = (*nl('%\\', '#\\'), *END_LINE_CHARS)
+    MULTI_LINE_COMMENT_START         = ('\\%->', '\\#->')
+    MULTI_LINE_COMMENT_END           = (*nl('<-\\', '<-%\\', '<-#\\'),)
 
 del nl
 
@@ -2,11 +2,15 @@ from compiler import Compiler, Error
 from constants import OUT_TAB, STD_DIR
 import os
 
-def main(input_file_path, output_file_path=None, print_progress_bars=False, encoding='utf-8'):
+def main(input_file_path, output_file_path=None, print_progress_bars=False, encoding='utf-8', ast_cache_dir=None):
     """
     Takes a file path to the input plaintext file and a file path to the output
         file.
 
+    If ast_cache_dir is given, the parsed form of each file is cached in it so
+        that files which have not changed since the last compile do not have
+        to be parsed again.
+
     Returns the error if the file was not successfully compiled and a string containing
          the file path to the new file otherwise.
     """
@@ -14,17 +18,11 @@ def main(input_file_path, output_file_path=None, print_progress_bars=False, enco
     input_file_path = os.path.abspath(input_file_path)
 
     if output_file_path is None:
-        output_file_path = input_file_path.split('.')
-
-        if len(output_file_path) > 1:
-            output_file_path[-1] = 'pdf'
-        else:
-            output_file_path.append('pdf')
-
-        output_file_path = '.'.join(output_file_path)
+        # The input file path but with its extension (if it has one) changed to .pdf
+        output_file_path = os.path.splitext(input_file_path)[0] + '.pdf'
 
     try:
-        c = Compiler(input_file_path, os.path.abspath(STD_DIR), print_progress_bars, encoding)
+        c = Compiler(input_file_path, os.path.abspath(STD_DIR), print_progress_bars, encoding, ast_cache_dir)
         c.compile_and_draw_pdf(output_file_path)
     except Error as e:
         return e
@@ -41,12 +39,16 @@ if __name__ == "__main__":
             help='The path to the output file you want. Without this, the output file is just the input file path with the ending changed to .pdf')
     p.add_argument('-e', '--encoding', type=str, nargs='?', default='utf-8',
             help='The encoding that your files are in. For example, if your files are in utf-32, then specify utf-32. The default encoding is utf-8.')
+    p.add_argument('-ac', '--ast_cache_dir', type=str, nargs='?', default=None,
+            help='A directory to cache the parsed form of each file in so that files that have not changed since the last compile do not need to be parsed again. Only point this at a directory that you trust because the cached files are loaded with pickle. Without this, nothing is cached.')
     #p.add_argument('-v', '--verbosity', type=int,
             #help='The level of logging you want.')
     #p.add_argument('-c', '--continous', action="store_true",
             #help='Continuouly compile the file every time it is resaved.')
     p.add_argument('-np', '--no_progress', action="store_true",
             help='Gets rid of the progress bars that are normally shown whenever you compile the PDF.')
+    p.add_argument('-pf', '--profile', action="store_true",
+            help='Profiles the compilation and, once it is done, prints the functions that the most time was spent in. This is meant for finding out what is making the compiler slow.')
     args = p.parse_args()
 
     input_file_path = os.path.abspath(os.path.expandvars(os.path.expanduser(args.input_file_path)))
@@ -66,7 +68,21 @@ if __name__ == "__main__":
     if args.no_progress:
         print(f'{OUT_TAB}.\n{OUT_TAB}.\n{OUT_TAB}.')
 
-    res = main(args.input_file_path, args.output_file_path, not args.no_progress, args.encoding)
+    ast_cache_dir = None if args.ast_cache_dir is None else os.path.abspath(os.path.expandvars(os.path.expanduser(args.ast_cache_dir)))
+
+    main_args = (args.input_file_path, args.output_file_path, not args.no_progress, args.encoding, ast_cache_dir)
+
+    if args.profile:
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        res = profiler.runcall(main, *main_args)
+
+        print('\n\nProfile of the Compilation\n')
+        pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(30)
+    else:
+        res = main(*main_args)
 
     if not isinstance(res, str):
         print('\n\nAn Error Occured\n', end='')
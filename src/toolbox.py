@@ -21,6 +21,12 @@ _page_sizes = named_tuple('PageSize', [key for key in PAGE_SIZES_DICT])(*[value
 
 _colors = named_tuple('Colors', [key for key in COLORS])(*[Color.from_str(val) for val in COLORS.values()])
 
+# The (width, height) that ToolBox.string_size has measured for each
+#   (string, font name, font size) it has been given. It is cleared if it ever
+#   holds more than _MAX_STRING_SIZES of them.
+_string_sizes = {}
+_MAX_STRING_SIZES = 200_000
+
 def _find_fonts(directories:list=None):
     """
     Checks the given directories for fonts, and puts all the fonts found in them
@@ -571,8 +577,21 @@ class ToolBox:
             if not_found:
                 raise AssertionError(f'The font "{font_name}" needs to be imported before its use')
 
-        text_info.apply_to_canvas(GLOBAL_FPDF)
+        # A word's size only depends on its text, font, and font size, and
+        #   the same words are measured over and over (twice each, with and
+        #   without a space after them), so sizes are remembered by those
+        key = (string, font_name, font_size)
+        size = _string_sizes.get(key)
+
+        if size is None:
+            text_info.apply_to_canvas(GLOBAL_FPDF)
+            size = (Decimal(GLOBAL_FPDF.get_string_width(string)), Decimal(font_size))
+
+            if len(_string_sizes) >= _MAX_STRING_SIZES:
+                _string_sizes.clear()
+
+            _string_sizes[key] = size
 
-        return (Decimal(GLOBAL_FPDF.get_string_width(string)), Decimal(font_size))
+        return size
 
 
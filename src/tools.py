@@ -2,6 +2,8 @@ from decimal import Decimal
 from constants import WHITE_SPACE_CHARS, OUT_TAB
 from constants import PB_SUFFIX, PB_NUM_DECS, PB_LEN, PB_UNFILL, PB_FILL, PB_NUM_TABS, PB_NAME_SPACE, PB_PREFIX_SPACE
 import os
+import gc
+from contextlib import contextmanager
 
 def assure_decimal(val):
     """
@@ -246,6 +248,58 @@ def trimmed(string):
         return string[first_index:last_index + 1]
 
 
+@contextmanager
+def paused_gc():
+    """
+    Pauses Python's cyclic garbage collector for the duration of the with
+        block, turning it back on afterwards if it was on to begin with.
+
+    Making lots of objects that are never in reference cycles (such as the
+        Tokens and Positions made for a whole file) otherwise sets off
+        collection after collection that cannot free any of them.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+# Compiled code objects by (python source, compile mode), so that python that
+#   is run over and over again (such as the python in the body of a command
+#   that is called many times) is only compiled the first time
+_compiled_python = {}
+_MAX_COMPILED_PYTHON = 10_000
+
+def _compile_python(code, mode):
+    """
+    Returns the code object for the given python source, compiled in the
+        given mode ('exec' or 'eval') the way that exec and eval would
+        compile it. If the source does not compile, the source itself is
+        returned so that exec or eval raises the SyntaxError exactly as
+        it would have otherwise.
+    """
+    key = (code, mode)
+    compiled = _compiled_python.get(key)
+
+    if compiled is None:
+        if len(_compiled_python) >= _MAX_COMPILED_PYTHON:
+            _compiled_python.clear()
+
+        try:
+            # eval ignores any spaces and tabs before the source, but compile
+            #   does not
+            compiled = compile(code if mode == 'exec' else code.lstrip(' \t'), '<string>', mode)
+        except Exception:
+            compiled = code
+
+        _compiled_python[key] = compiled
+
+    return compiled
+
+
 def exec_python(code, exec_globals:dict, exec_locals:dict=None):
     """
     Executes python code and returns the value stored in 'ret' if it was
@@ -253,7 +307,7 @@ def exec_python(code, exec_globals:dict, exec_locals:dict=None):
     """
     from marked_up_text import MarkedUpText
     try:
-        exec(code, exec_globals, exec_locals)
+        exec(_compile_python(code, 'exec'), exec_globals, exec_locals)
     except Exception as e:
         import traceback
         e.exc_trace = traceback.format_exc()
@@ -278,7 +332,7 @@ def eval_python(code:str, eval_globals:dict, eval_locals:dict=None):
     """
     from marked_up_text import MarkedUpText
     try:
-        res = eval(code, eval_globals, eval_locals)
+        res = eval(_compile_python(code, 'eval'), eval_globals, eval_locals)
     except Exception as e:
         import traceback
         e.exc_trace = traceback.format_exc()